@@ -1,11 +1,20 @@
 #!/bin/bash
 
 # build.sh - Build Library Manager with PyQt5 and icon
-# Usage: ./build.sh
+# Usage: ./build.sh [--force-clean]
+#   --force-clean  wipe build/, dist/ and the PyInstaller cache before building
 
 echo "📚 Building Library Manager with PyQt5..."
 echo "========================================="
 
+# Options
+FORCE_CLEAN=0
+for arg in "$@"; do
+    case "$arg" in
+        --force-clean) FORCE_CLEAN=1 ;;
+    esac
+done
+
 # Check Python
 if ! command -v py &> /dev/null; then
     echo "❌ Python not found!"
@@ -21,16 +30,36 @@ fi
 
 echo "✅ Found icon.ico"
 
-# Clean previous builds
-echo "🧹 Cleaning previous builds..."
-rm -rf build/ dist/ *.spec 2>/dev/null
+# Compress with UPX when it is on PATH
+UPX_FLAGS=()
+if command -v upx &> /dev/null; then
+    UPX_DIR=$(dirname "$(command -v upx)")
+    echo "✅ Found UPX in $UPX_DIR"
+    UPX_FLAGS=(--upx-dir="$UPX_DIR" --upx-exclude=vcruntime140.dll)
+else
+    echo "ℹ️  UPX not found, building uncompressed (see https://upx.github.io)"
+fi
+
+# Clean previous builds only on request, so PyInstaller can reuse its
+# analysis cache in build/ for incremental rebuilds
+CLEAN_FLAG=""
+if [ "$FORCE_CLEAN" -eq 1 ]; then
+    echo "🧹 Cleaning previous builds..."
+    rm -rf build/ dist/ *.spec 2>/dev/null
+    CLEAN_FLAG="--clean"
+else
+    echo "♻️  Reusing previous build cache (pass --force-clean for a full rebuild)"
+    rm -rf dist/ 2>/dev/null
+fi
 
 # Build
 echo "🛠️  Building executable..."
 py -m PyInstaller \
     --onefile \
     --windowed \
-    --clean \
+    --noconfirm \
+    $CLEAN_FLAG \
+    "${UPX_FLAGS[@]}" \
     --name="LibraryManager" \
     --icon="icon.ico" \
 	--add-data "icon.ico;." \
@@ -43,6 +72,16 @@ py -m PyInstaller \
     --exclude-module=PyQt6 \
     --exclude-module=PySide2 \
     --exclude-module=PySide6 \
+    --exclude-module=tkinter \
+    --exclude-module=unittest \
+    --exclude-module=test \
+    --exclude-module=pydoc \
+    --exclude-module=xmlrpc \
+    --exclude-module=http.server \
+    --exclude-module=distutils \
+    --exclude-module=pdb \
+    --exclude-module=doctest \
+    --exclude-module=lib2to3 \
     libraryManager_win8.py
 
 # Check result
@@ -1,6 +1,7 @@
 # libraryManager_modern_light.py
 import sys, os, json, datetime
 from typing import List, Dict
+from functools import lru_cache
 
 if hasattr(sys, '_MEIPASS'):
     # PyInstaller bundle
@@ -21,49 +22,271 @@ from PyQt6.QtGui import (
 
 # Keep the try/except for qt_material only
 try:
-    from qt_material import apply_stylesheet
+    from qt_material import build_stylesheet
     QT_MATERIAL_AVAILABLE = True
 except Exception:
     QT_MATERIAL_AVAILABLE = False
 
+# orjson is much faster than json for saving; fall back to json without it
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
 # ---------- Helpers ----------
-def to_jalali(date_str: str) -> str:
-    """Convert 'YYYY-MM-DD' to Jalali 'YYYY/MM/DD' — if invalid return '-'"""
+def to_jalali(date_str) -> str:
+    """Convert 'YYYY-MM-DD' to Jalali 'YYYY/MM/DD' — '-' if empty, the input as text if invalid
+
+    Never raises: it runs inside the table models' data(), where an exception aborts Qt."""
     if not date_str:
         return "-"
+    if not isinstance(date_str, str):
+        return str(date_str)  # e.g. a number in hand-edited JSON (and not hashable for the cache)
+    return _to_jalali_cached(date_str)
+
+@lru_cache(maxsize=4096)
+def _to_jalali_cached(date_str: str) -> str:
+    """String conversion behind to_jalali — cached: the same few dates repeat across every table row."""
     try:
-        y, m, d = map(int, date_str.split('-'))
+        if len(date_str) == 10 and date_str[4] == date_str[7] == "-":
+            y, m, d = int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10])
+        else:
+            y, m, d = map(int, date_str.split('-'))
         jd = jdatetime.date.fromgregorian(year=y, month=m, day=d)
-        return jd.strftime("%Y/%m/%d")
-    except Exception:
+    except ValueError:
         return date_str
+    return f"{jd.year:04d}/{jd.month:02d}/{jd.day:02d}"
+
+def today_gregorian_str(days: int = 0) -> str:
+    """Today's date (or `days` after it) as 'YYYY-MM-DD'"""
+    return QtCore.QDate.currentDate().addDays(days).toString("yyyy-MM-dd")
+
+def dump_json(data, pretty: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON bytes — compact unless pretty (2-space indent) is asked for"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def write_atomic(path: str, data: bytes):
+    """Write data to path via a temp file and os.replace, so a crash never leaves a half-written file"""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def load_json(path: str):
+    """Read and parse a UTF-8 JSON file"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+def date_ordinal(date_str: str) -> int:
+    """Day number (date.toordinal) of a 'YYYY-MM-DD' string — raises ValueError if invalid"""
+    try:
+        return datetime.date.fromisoformat(date_str).toordinal()
+    except ValueError:
+        # hand-edited data may carry unpadded dates such as '2024-1-5'
+        y, m, d = map(int, date_str.split('-'))
+        return datetime.date(y, m, d).toordinal()
+
+def without_cache_fields(records: List[Dict]) -> List[Dict]:
+    """Copy of records without the '_'-prefixed fields cached on them at runtime"""
+    return [{k: v for k, v in r.items() if not k.startswith("_")} for r in records]
+
+MEMBER_SEARCH_FIELDS = ("first_name", "last_name", "student_id", "national_id", "phone")
+BOOK_SEARCH_FIELDS = ("title", "author", "publish_date")
+
+def search_haystack(record: Dict, fields) -> str:
+    """Lower-cased search text of a record, cached on it as '_haystack'.
+
+    Fields are joined with newlines, which a search term never contains, so a
+    term still has to match inside a single field. Drop '_haystack' when the
+    record is edited."""
+    haystack = record.get("_haystack")
+    if haystack is None:
+        haystack = record["_haystack"] = "\n".join(str(record.get(f, "")) for f in fields).lower()
+    return haystack
+
+def matches_search(haystack: str, terms) -> bool:
+    """Whether every search term occurs in a haystack (always true for no terms)"""
+    return all(term in haystack for term in terms)
+
+def book_status(book: Dict) -> str:
+    """Availability text shown in the books table"""
+    available_copies = book.get("available_copies", 0)
+    total_copies = book.get("total_copies", 0)
+    if available_copies > 0:
+        return f"آزاد ({available_copies} از {total_copies})"
+    return f"امانت داده شده (0 از {total_copies})"
+
+def emoji_icon(ch: str, size: int = 24) -> QIcon:
+    """Render an emoji once into a QIcon so buttons don't reshape the color-emoji glyph on every paint"""
+    ratio = QtWidgets.QApplication.instance().devicePixelRatio()
+    pm = QtGui.QPixmap(int(size * ratio), int(size * ratio))
+    pm.setDevicePixelRatio(ratio)
+    pm.fill(QtCore.Qt.GlobalColor.transparent)
+    p = QtGui.QPainter(pm)
+    p.setFont(QFont("Segoe UI Emoji", int(size * 0.6)))
+    p.drawText(QtCore.QRectF(0, 0, size, size), QtCore.Qt.AlignmentFlag.AlignCenter, ch)
+    p.end()
+    return QIcon(pm)
+
+_DIGITS_VALIDATOR = None
+
+def digits_validator() -> QtGui.QRegularExpressionValidator:
+    """Digits-only validator shared by every numeric line edit (validators are stateless)"""
+    global _DIGITS_VALIDATOR
+    if _DIGITS_VALIDATOR is None:
+        _DIGITS_VALIDATOR = QtGui.QRegularExpressionValidator(QtCore.QRegularExpression("[0-9]*"))
+    return _DIGITS_VALIDATOR
+
+def to_int(value) -> int:
+    """Return value as int for numeric columns — 0 if it cannot be converted"""
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
+class RecordTableModel(QtCore.QAbstractTableModel):
+    """Read-only table model over a list of records (dicts or tuples).
+
+    Each column is a function that returns the raw value of that column for a
+    record. The raw value is served as SortRole so numeric columns sort
+    numerically, and formatted with the column's display format for display.
+    Cells are only materialized when the view asks for them.
+    """
+    SortRole = QtCore.Qt.ItemDataRole.UserRole
+
+    def __init__(self, headers, columns, formats=None, parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._columns = list(columns)
+        self._formats = formats or {}
+        self._rows = []
+        self._row_by_id = {}  # id(record) -> row, so row_of is a lookup; the rows keep the ids alive
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._row_by_id = {id(r): row for row, r in enumerate(self._rows)}
+        self.endResetModel()
+
+    def record(self, row):
+        return self._rows[row]
+
+    def row_of(self, record) -> int:
+        """Row holding this very record object — -1 if it is not shown"""
+        return self._row_by_id.get(id(record), -1)
+
+    def append_record(self, record):
+        row = len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._rows.append(record)
+        self._row_by_id[id(record)] = row
+        self.endInsertRows()
+
+    def remove_record(self, record):
+        row = self.row_of(record)
+        if row < 0:
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self._rows[row]
+        del self._row_by_id[id(record)]
+        for later_row in range(row, len(self._rows)):  # the rows after it move up by one
+            self._row_by_id[id(self._rows[later_row])] = later_row
+        self.endRemoveRows()
+
+    def record_changed(self, record):
+        """Repaint the row of a record that was edited in place"""
+        row = self.row_of(record)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._columns) - 1))
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            value = self._columns[index.column()](self._rows[index.row()])
+            fmt = self._formats.get(index.column())
+            if fmt is not None:
+                return fmt.format(value)
+            return value if isinstance(value, str) else str(value)
+        if role == self.SortRole:
+            return self._columns[index.column()](self._rows[index.row()])
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.DisplayRole and orientation == QtCore.Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+# فقط دکمه‌های داخل section_card را سبز کنید
+APP_QSS = """
+QPushButton {
+    background-color: #4CAF50 !important;
+    color: white !important;
+    border: none !important;
+    padding: 8px 16px !important;
+    border-radius: 6px !important;
+    font-weight: bold !important;
+    font-size: 13px !important;
+    min-height: 30px !important;
+}
+QPushButton:hover {
+    background-color: #45a049 !important;
+}
+QPushButton:pressed {
+    background-color: #3d8b40 !important;
+}
+
+/* دکمه‌های خطر (حذف) */
+QPushButton[danger="true"] {
+    background-color: #f44336 !important;
+}
+QPushButton[danger="true"]:hover {
+    background-color: #da190b !important;
+}
+
+/* دکمه‌های اطلاعات (ویرایش) */
+QPushButton[info="true"] {
+    background-color: #2196F3 !important;
+}
+QPushButton[info="true"]:hover {
+    background-color: #0b7dda !important;
+}
+
+/* جدول‌ها */
+QTableView {
+    gridline-color: #e0e0e0;
+    background-color: #ffffff;
+    alternate-background-color: #fafafa;
+    selection-background-color: #d9edf7;
+    selection-color: #000;
+    border: 1px solid #ddd;
+}
+QHeaderView::section {
+    background-color: #f7f7f7;
+    border: 1px solid #e0e0e0;
+    font-weight: bold;
+    padding: 4px;
+}
+"""
 
-def today_gregorian_str() -> str:
-    return datetime.date.today().strftime("%Y-%m-%d")
-
-class NumericTableWidgetItem(QtWidgets.QTableWidgetItem):
-    def __init__(self, value, display_format="{}"):
-        # مقدار عددی را ذخیره می‌کنیم
-        if isinstance(value, (int, float)):
-            self._value = value
-        else:
-            try:
-                self._value = int(value)
-            except (ValueError, TypeError):
-                self._value = 0
-                
-        # نمایش فرمت شده را تنظیم می‌کنیم
-        display_text = display_format.format(self._value)
-        super().__init__(display_text)
-        
-    def __lt__(self, other):
-        """برای مرتب‌سازی عددی"""
-        if isinstance(other, NumericTableWidgetItem):
-            return self._value < other._value
-        return super().__lt__(other)
 # ---------- Main Window ----------
 class LibraryApp(QtWidgets.QMainWindow):
     DATA_FILE = "library_data.json"
+    _app_qss = None  # final application stylesheet, set once by apply_styles
 
     def __init__(self):
         super().__init__()
@@ -71,10 +294,21 @@ class LibraryApp(QtWidgets.QMainWindow):
         self.resize(1200, 760)
         self.setLayoutDirection(QtCore.Qt.LayoutDirection.RightToLeft)
 
+        # Apply the app stylesheet before any widget is built, so nothing is polished twice
+        self.apply_styles()
+
         # Data
         self.members: List[Dict] = []
         self.books: List[Dict] = []
         self.loans: List[Dict] = []
+        # Lookup indexes, kept in step with the lists above
+        self._members_by_id: Dict[str, Dict] = {}
+        self._member_names: Dict[str, str] = {}
+        self._books_by_id: Dict[str, Dict] = {}
+        self._loans_by_member: Dict[str, List[Dict]] = {}
+        self._loans_by_book: Dict[str, List[Dict]] = {}
+        self._active_loans: List[Dict] = []  # loans not yet returned
+        self._available_total = 0  # sum of available_copies over all books
         self.settings = {"default_loan_period": 14, "fine_per_day": 1000}
 
         # Central container
@@ -96,14 +330,14 @@ class LibraryApp(QtWidgets.QMainWindow):
         title_lbl.setStyleSheet("font-weight:700; font-size:18px; padding:6px;")
         s_layout.addWidget(title_lbl)
 
-        # Sidebar buttons (emoji icons for portability)
-        self.btn_dashboard = QtWidgets.QPushButton("🏠  داشبورد")
-        self.btn_members = QtWidgets.QPushButton("👥  اعضا")
-        self.btn_books = QtWidgets.QPushButton("📖  کتاب‌ها")
-        self.btn_loans = QtWidgets.QPushButton("🔁  امانت‌ها")
-        self.btn_member_details = QtWidgets.QPushButton("👤  جزئیات عضو")
-        self.btn_book_details = QtWidgets.QPushButton("📚  جزئیات کتاب")
-        self.btn_settings = QtWidgets.QPushButton("⚙️  تنظیمات")
+        # Sidebar buttons (emoji pre-rendered as icons, plain text labels)
+        self.btn_dashboard = QtWidgets.QPushButton(emoji_icon("🏠"), " داشبورد")
+        self.btn_members = QtWidgets.QPushButton(emoji_icon("👥"), " اعضا")
+        self.btn_books = QtWidgets.QPushButton(emoji_icon("📖"), " کتاب‌ها")
+        self.btn_loans = QtWidgets.QPushButton(emoji_icon("🔁"), " امانت‌ها")
+        self.btn_member_details = QtWidgets.QPushButton(emoji_icon("👤"), " جزئیات عضو")
+        self.btn_book_details = QtWidgets.QPushButton(emoji_icon("📚"), " جزئیات کتاب")
+        self.btn_settings = QtWidgets.QPushButton(emoji_icon("⚙️"), " تنظیمات")
 
         for btn in [self.btn_dashboard, self.btn_members, self.btn_books, self.btn_loans,
                     self.btn_member_details, self.btn_book_details, self.btn_settings]:
@@ -126,47 +360,102 @@ class LibraryApp(QtWidgets.QMainWindow):
         self.stack = QtWidgets.QStackedWidget()
         root_layout.addWidget(self.stack, 1)
 
-        # Create pages
+        # Create pages — only the dashboard up front, the rest on first visit (see show_page)
         self.page_dashboard = self.create_dashboard_page()
-        self.page_members = self.create_members_page()
-        self.page_books = self.create_books_page()
-        self.page_loans = self.create_loans_page()
-        self.page_member_details = self.create_member_details_page()
-        self.page_book_details = self.create_book_details_page()
-        self.page_settings = self.create_settings_and_backup_page()
-
-        # Add to stack
-        for p in [self.page_dashboard, self.page_members, self.page_books, self.page_loans,
-                  self.page_member_details, self.page_book_details, self.page_settings]:
-            self.stack.addWidget(p)
+        self.stack.addWidget(self.page_dashboard)
+        self.page_members = None
+        self.page_books = None
+        self.page_loans = None
+        self.page_member_details = None
+        self.page_book_details = None
+        self.page_settings = None
+        # name -> (builder, refresh to run right after building)
+        self._page_builders = {
+            "members": (self.create_members_page, self.load_members_table),
+            "books": (self.create_books_page, self.load_books_table),
+            "loans": (self.create_loans_page, self.refresh_loans_page),
+            "member_details": (self.create_member_details_page, None),
+            "book_details": (self.create_book_details_page, None),
+            "settings": (self.create_settings_and_backup_page, None),
+        }
+        # Stale parts of the UI: tag -> (page it lives on, refresh); refreshed when that page is shown
+        self._refreshers = {
+            "stats": ("dashboard", self.update_stats),
+            "overdue": ("dashboard", self.update_overdue_table),
+            "loans": ("loans", self.update_loan_combos),
+            "member_details": ("member_details", self.search_member_details),
+            "book_details": ("book_details", self.search_book_details),
+        }
+        self._dirty = set()
+        self._refresh_queued = False
+        self.stack.currentChanged.connect(self.on_page_changed)
 
         # Connect sidebar
         self.btn_dashboard.clicked.connect(lambda: self.stack.setCurrentWidget(self.page_dashboard))
-        self.btn_members.clicked.connect(lambda: self.stack.setCurrentWidget(self.page_members))
-        self.btn_books.clicked.connect(lambda: self.stack.setCurrentWidget(self.page_books))
-        self.btn_loans.clicked.connect(lambda: self.stack.setCurrentWidget(self.page_loans))
-        self.btn_member_details.clicked.connect(lambda: self.stack.setCurrentWidget(self.page_member_details))
-        self.btn_book_details.clicked.connect(lambda: self.stack.setCurrentWidget(self.page_book_details))
-        self.btn_settings.clicked.connect(lambda: self.stack.setCurrentWidget(self.page_settings))
+        self.btn_members.clicked.connect(lambda: self.show_page("members"))
+        self.btn_books.clicked.connect(lambda: self.show_page("books"))
+        self.btn_loans.clicked.connect(lambda: self.show_page("loans"))
+        self.btn_member_details.clicked.connect(lambda: self.show_page("member_details"))
+        self.btn_book_details.clicked.connect(lambda: self.show_page("book_details"))
+        self.btn_settings.clicked.connect(lambda: self.show_page("settings"))
+
+        # Saves are coalesced: save_data() marks the data dirty and flush_data() writes it
+        self._save_pending = False
+        self._save_timer = self.create_debounce_timer(self.flush_data, 500)
 
         # Load and refresh
         self.load_data()
         self.refresh_ui()
 
-        # Apply polish stylesheet
-        self.apply_styles()
-
     # ---------- UI pages ----------
-    def create_section_card(self, title: str, color: str = "#ffffff"):
+    def show_page(self, name: str):
+        """Switch the stack to page `name`, building and filling it on first use."""
+        page = getattr(self, f"page_{name}")
+        if page is None:
+            builder, refresh = self._page_builders[name]
+            page = builder()
+            setattr(self, f"page_{name}", page)
+            self.stack.addWidget(page)
+            if refresh:
+                refresh()
+        self.stack.setCurrentWidget(page)
+
+    def mark_dirty(self, *tags: str):
+        """Queue the UI parts `tags` (keys of _refreshers) for a refresh.
+
+        Parts on the shown page are refreshed once control returns to the event
+        loop, so a burst of changes costs one refresh; hidden ones wait until
+        their page is shown."""
+        for tag in tags:
+            if getattr(self, f"page_{self._refreshers[tag][0]}") is not None:  # unbuilt pages are filled when first shown
+                self._dirty.add(tag)
+        if self._dirty and not self._refresh_queued:
+            self._refresh_queued = True
+            QtCore.QTimer.singleShot(0, self.refresh_current_page)
+
+    def refresh_current_page(self):
+        self._refresh_queued = False
+        self.on_page_changed(self.stack.currentIndex())
+
+    def on_page_changed(self, index: int):
+        page = self.stack.widget(index)
+        for tag in list(self._dirty):
+            page_name, refresh = self._refreshers[tag]
+            if getattr(self, f"page_{page_name}") is page:
+                self._dirty.discard(tag)
+                refresh()
+
+    def create_section_card(self, title: str, color: str = "#ffffff", layout_cls=QtWidgets.QVBoxLayout):
         """
-        Create a styled QGroupBox section with shadow and custom styling
+        Create a styled QGroupBox section with a light border and custom styling
         
         Args:
             title (str): Section title
             color (str): Background color hex
+            layout_cls: Layout class installed on the section (QVBoxLayout by default)
         
         Returns:
-            tuple: (QGroupBox, QVBoxLayout) - The section and its layout
+            tuple: (QGroupBox, layout) - The section and its layout
         """
         section = QtWidgets.QGroupBox(title)
         
@@ -174,7 +463,8 @@ class LibraryApp(QtWidgets.QMainWindow):
         section.setStyleSheet(f"""
             QGroupBox {{
                 background-color: {color};
-                border: 0px solid #e0e0e0;
+                border: 1px solid #e0e0e0;
+                border-bottom: 2px solid #d6d6d6;
                 border-radius: 12px;
                 padding: 40px 15px 15px 15px;
                 margin-top: 10px;
@@ -192,13 +482,6 @@ class LibraryApp(QtWidgets.QMainWindow):
             }}
         """)
         
-        # Add shadow effect
-        shadow_effect = QtWidgets.QGraphicsDropShadowEffect()
-        shadow_effect.setBlurRadius(20)
-        shadow_effect.setColor(QtGui.QColor(0, 0, 0, 40))
-        shadow_effect.setOffset(0, 3)
-        section.setGraphicsEffect(shadow_effect)
-        
         # Set font
         font = QtGui.QFont()
         font.setPointSize(18)
@@ -206,7 +489,7 @@ class LibraryApp(QtWidgets.QMainWindow):
         section.setFont(font)
         
         # Create and set layout
-        layout = QtWidgets.QVBoxLayout(section)
+        layout = layout_cls(section)
         
         return section, layout
         
@@ -218,13 +501,6 @@ class LibraryApp(QtWidgets.QMainWindow):
             border-radius:12px;
         """)
         
-        shadow = QtWidgets.QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(20)
-        shadow.setXOffset(0)
-        shadow.setYOffset(3)
-        shadow.setColor(QtGui.QColor(0, 0, 0, 40))
-        card.setGraphicsEffect(shadow)
-        
         v = QtWidgets.QVBoxLayout(card)
         header = QtWidgets.QLabel(title)
         header.setStyleSheet("font-weight:700; padding:8px;")
@@ -242,14 +518,6 @@ class LibraryApp(QtWidgets.QMainWindow):
             border:{border}px solid #dfe6ee;
         """)
         
-        # 🔹 افزودن سایه واقعی با Qt
-        shadow = QtWidgets.QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(20)              # میزان پخش سایه
-        shadow.setXOffset(0)
-        shadow.setYOffset(3)
-        shadow.setColor(QtGui.QColor(0, 0, 0, 40))  # رنگ خاکستری با شفافیت
-        card.setGraphicsEffect(shadow)
-        
         v = QtWidgets.QVBoxLayout(card)
         header = QtWidgets.QLabel(title)
         header.setStyleSheet("font-weight:700; padding:8px;")
@@ -257,6 +525,64 @@ class LibraryApp(QtWidgets.QMainWindow):
         v.addWidget(header)
         return card, v
 
+    def create_table(self, model: RecordTableModel):
+        """Return a read-only, sortable QTableView showing `model` through a sort proxy."""
+        proxy = QtCore.QSortFilterProxyModel(self)
+        proxy.setSourceModel(model)
+        proxy.setSortRole(RecordTableModel.SortRole)
+
+        table = QtWidgets.QTableView()
+        table.setModel(proxy)
+        table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
+
+        # اندازه ثابت ستون‌ها و ردیف‌ها تا Qt برای محاسبه اندازه همه سلول‌ها را نخواند
+        h_header = table.horizontalHeader()
+        h_header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Interactive)
+        h_header.setDefaultSectionSize(150)
+        h_header.setStretchLastSection(True)
+        v_header = table.verticalHeader()
+        v_header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        v_header.setDefaultSectionSize(28)
+
+        table.setSortingEnabled(True)
+        return table
+
+    def create_debounce_timer(self, slot, interval: int = 150):
+        """Single-shot timer that runs `slot` once the user stops typing for `interval` ms."""
+        timer = QtCore.QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(interval)
+        timer.timeout.connect(slot)
+        return timer
+
+    def record_at(self, table: QtWidgets.QTableView, index: QtCore.QModelIndex):
+        """Return the source record behind a (proxy) index of `table`."""
+        proxy = table.model()
+        return proxy.sourceModel().record(proxy.mapToSource(index).row())
+
+    def selected_record(self, table: QtWidgets.QTableView):
+        """Return the record of the table's current row, or None if nothing is selected."""
+        index = table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.record_at(table, index)
+
+    def member_name(self, member_id) -> str:
+        """Display name of a member, falling back to the raw member id."""
+        return self._member_names.get(member_id, member_id or "")
+
+    def loan_haystack(self, loan: Dict) -> str:
+        """Lower-cased search text of a loan (id, member name, title, dates), cached as '_haystack'."""
+        haystack = loan.get("_haystack")
+        if haystack is None:
+            haystack = loan["_haystack"] = "\n".join((
+                str(loan.get("id", "")), self._member_names.get(loan.get("member_id"), ""),
+                loan.get("book_title", ""), loan.get("loan_date", ""), loan.get("due_date", ""),
+            )).lower()
+        return haystack
+
     def create_dashboard_page(self):
         page = QtWidgets.QWidget()
         layout = QtWidgets.QVBoxLayout(page)
@@ -298,31 +624,14 @@ class LibraryApp(QtWidgets.QMainWindow):
 
         # Overdue table card
         overdue_card, overdue_layout = self.create_section_card("امانت‌های سررسید گذشته", "#ffffff")
-        self.overdue_table = QtWidgets.QTableWidget(0, 5)
-        
-        self.overdue_table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #e0e0e0;
-                background-color: #ffffff;
-                alternate-background-color: #fafafa;
-                selection-background-color: #d9edf7;
-                selection-color: #000;
-                border: 1px solid #ddd;
-            }
-            QHeaderView::section {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                font-weight: bold;
-                padding: 4px;
-            }
-        """)
-        
-        self.overdue_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.overdue_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
-        self.overdue_table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
-        
-        self.overdue_table.setHorizontalHeaderLabels(["عضو", "کتاب", "تاریخ سررسید", "روز تأخیر", "جریمه (تومان)"])
-        self.overdue_table.horizontalHeader().setStretchLastSection(True)
+        # ردیف‌ها: (نام عضو، عنوان کتاب، تاریخ سررسید، روز تأخیر، جریمه)
+        self.overdue_model = RecordTableModel(
+            ["عضو", "کتاب", "تاریخ سررسید", "روز تأخیر", "جریمه (تومان)"],
+            [lambda r: r[0], lambda r: r[1], lambda r: to_jalali(r[2]), lambda r: r[3], lambda r: r[4]],
+            {4: "{:,}"}
+        )
+        self.overdue_table = self.create_table(self.overdue_model)
+
         overdue_layout.addWidget(self.overdue_table)
         layout.addWidget(overdue_card)
 
@@ -349,8 +658,7 @@ class LibraryApp(QtWidgets.QMainWindow):
         form = QtWidgets.QFormLayout()
         form.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
         
-        # ایجاد validator برای فیلدهای عددی
-        only_digits_validator = QtGui.QRegularExpressionValidator(QtCore.QRegularExpression("[0-9]*"))
+        only_digits_validator = digits_validator()
 
         self.input_student_id = QtWidgets.QLineEdit()
         self.input_national_id = QtWidgets.QLineEdit()
@@ -397,7 +705,8 @@ class LibraryApp(QtWidgets.QMainWindow):
         actions = QtWidgets.QHBoxLayout()
         self.member_search = QtWidgets.QLineEdit()
         self.member_search.setPlaceholderText("🔍 جستجوی اعضا...")
-        self.member_search.textChanged.connect(self.search_members)
+        self._member_search_timer = self.create_debounce_timer(self.search_members)
+        self.member_search.textChanged.connect(lambda _: self._member_search_timer.start())
 
         btn_edit = QtWidgets.QPushButton("✏️ ویرایش عضو")
         btn_delete = QtWidgets.QPushButton("🗑️ حذف عضو")
@@ -414,29 +723,13 @@ class LibraryApp(QtWidgets.QMainWindow):
         table_layout.addLayout(actions)
 
         # 🔹 جدول اعضا
-        self.members_table = QtWidgets.QTableWidget(0, 5)
-        self.members_table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #e0e0e0;
-                background-color: #ffffff;
-                alternate-background-color: #fafafa;
-                selection-background-color: #d9edf7;
-                selection-color: #000;
-                border: 1px solid #ddd;
-            }
-            QHeaderView::section {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                font-weight: bold;
-                padding: 4px;
-            }
-        """)
-        self.members_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.members_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
-        self.members_table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
-        self.members_table.setHorizontalHeaderLabels(["شماره دانشجویی", "کد ملی", "تلفن", "نام", "نام خانوادگی"])
-        self.members_table.horizontalHeader().setStretchLastSection(True)
-        self.members_table.cellDoubleClicked.connect(self.on_member_double_click)
+        self.members_model = RecordTableModel(
+            ["شماره دانشجویی", "کد ملی", "تلفن", "نام", "نام خانوادگی"],
+            [lambda m: m.get("student_id", ""), lambda m: m.get("national_id", ""), lambda m: m.get("phone", ""),
+             lambda m: m.get("first_name", ""), lambda m: m.get("last_name", "")]
+        )
+        self.members_table = self.create_table(self.members_model)
+        self.members_table.doubleClicked.connect(self.on_member_double_click)
 
         table_layout.addWidget(self.members_table)
         top.addWidget(table_card, 2)
@@ -494,7 +787,8 @@ class LibraryApp(QtWidgets.QMainWindow):
         actions = QtWidgets.QHBoxLayout()
         self.book_search = QtWidgets.QLineEdit()
         self.book_search.setPlaceholderText("🔍 جستجوی کتاب‌ها...")
-        self.book_search.textChanged.connect(self.search_books)
+        self._book_search_timer = self.create_debounce_timer(self.search_books)
+        self.book_search.textChanged.connect(lambda _: self._book_search_timer.start())
 
         b_edit = QtWidgets.QPushButton("✏️ ویرایش کتاب")
         b_edit.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
@@ -511,29 +805,15 @@ class LibraryApp(QtWidgets.QMainWindow):
         table_layout.addLayout(actions)  # ← حالا بالای جدول اضافه شد
 
         # 🔹 جدول کتاب‌ها
-        self.books_table = QtWidgets.QTableWidget(0, 4)
-        self.books_table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #e0e0e0;
-                background-color: #ffffff;
-                alternate-background-color: #fafafa;
-                selection-background-color: #d9edf7;
-                selection-color: #000;
-                border: 1px solid #ddd;
-            }
-            QHeaderView::section {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                font-weight: bold;
-                padding: 4px;
-            }
-        """)
-        self.books_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.books_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
-        self.books_table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
-        self.books_table.setHorizontalHeaderLabels(["نام کتاب", "نویسنده", "تاریخ چاپ", "وضعیت"])
-        self.books_table.horizontalHeader().setStretchLastSection(True)
-        self.books_table.cellDoubleClicked.connect(self.on_book_double_click)
+        self.books_model = RecordTableModel(
+            ["نام کتاب", "نویسنده", "تاریخ چاپ", "وضعیت"],
+            [lambda b: b.get("title", "بدون عنوان") or "بدون عنوان",
+             lambda b: b.get("author", "بدون نویسنده") or "بدون نویسنده",
+             lambda b: to_jalali(b.get("publish_date", "تاریخ نامشخص") or "تاریخ نامشخص"),
+             book_status]
+        )
+        self.books_table = self.create_table(self.books_model)
+        self.books_table.doubleClicked.connect(self.on_book_double_click)
 
         table_layout.addWidget(self.books_table)
         top.addWidget(table_card, 2)
@@ -550,6 +830,9 @@ class LibraryApp(QtWidgets.QMainWindow):
 
         form_card, form_layout = self.create_section_card("اعطای امانت", "#FAFCFF")
         grid = QtWidgets.QGridLayout()
+        # ids of the combo entries, by position (filled in update_loan_combos)
+        self._loan_member_ids: List[str] = []
+        self._loan_book_ids: List[str] = []
         
         self.loan_book_combo = QtWidgets.QComboBox()
         self.loan_book_combo.setEditable(True)
@@ -557,8 +840,11 @@ class LibraryApp(QtWidgets.QMainWindow):
         self.loan_book_combo.lineEdit().setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
         self.loan_book_combo.setInsertPolicy(QtWidgets.QComboBox.InsertPolicy.NoInsert)
 
-        book_completer = QtWidgets.QCompleter(self.loan_book_combo.model(), self.loan_book_combo)
+        # completer روی یک لیست متنی جدا ساخته می‌شود تا با هر addItem کمبو دوباره فیلتر نشود
+        self.loan_book_names = QtCore.QStringListModel(self)
+        book_completer = QtWidgets.QCompleter(self.loan_book_names, self.loan_book_combo)
         book_completer.setFilterMode(QtCore.Qt.MatchFlag.MatchContains)
+        book_completer.setCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseInsensitive)
         book_completer.setCompletionMode(QtWidgets.QCompleter.CompletionMode.PopupCompletion)
         self.loan_book_combo.setCompleter(book_completer)
 
@@ -570,8 +856,10 @@ class LibraryApp(QtWidgets.QMainWindow):
         self.loan_member_combo.lineEdit().setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
         self.loan_member_combo.setInsertPolicy(QtWidgets.QComboBox.InsertPolicy.NoInsert)
 
-        member_completer = QtWidgets.QCompleter(self.loan_member_combo.model(), self.loan_member_combo)
+        self.loan_member_names = QtCore.QStringListModel(self)
+        member_completer = QtWidgets.QCompleter(self.loan_member_names, self.loan_member_combo)
         member_completer.setFilterMode(QtCore.Qt.MatchFlag.MatchContains)
+        member_completer.setCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseInsensitive)
         member_completer.setCompletionMode(QtWidgets.QCompleter.CompletionMode.PopupCompletion)
         self.loan_member_combo.setCompleter(member_completer)
         
@@ -590,40 +878,24 @@ class LibraryApp(QtWidgets.QMainWindow):
 
         # active loans table
         loans_card, loans_layout = self.create_section_card("امانت‌های فعال", "#FFFFFF")
-        self.active_loans_table = QtWidgets.QTableWidget(0, 5)
-        
-        self.active_loans_table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #e0e0e0;
-                background-color: #ffffff;
-                alternate-background-color: #fafafa;
-                selection-background-color: #d9edf7;
-                selection-color: #000;
-                border: 1px solid #ddd;
-            }
-            QHeaderView::section {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                font-weight: bold;
-                padding: 4px;
-            }
-        """)
-        
-        self.active_loans_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.active_loans_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
-        self.active_loans_table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
-        
-        self.active_loans_table.setHorizontalHeaderLabels(["شناسه", "عضو", "کتاب", "تاریخ امانت", "تاریخ سررسید"])
-        self.active_loans_table.horizontalHeader().setStretchLastSection(True)
-        loans_layout.addWidget(self.active_loans_table)
-        
+        self.active_loans_model = RecordTableModel(
+            ["شناسه", "عضو", "کتاب", "تاریخ امانت", "تاریخ سررسید"],
+            [lambda l: to_int(l.get("id", 0)), lambda l: self.member_name(l.get("member_id")),
+             lambda l: l.get("book_title", ""), lambda l: to_jalali(l.get("loan_date", "")),
+             lambda l: to_jalali(l.get("due_date", ""))]
+        )
+        self.active_loans_table = self.create_table(self.active_loans_model)
+
         # 🔍 نوار جستجو در بالای جدول امانت‌ها
         actions = QtWidgets.QHBoxLayout()
         self.loan_search = QtWidgets.QLineEdit()
         self.loan_search.setPlaceholderText("🔍 جستجوی امانت‌ها...")
-        self.loan_search.textChanged.connect(self.search_loans)
+        self._loan_search_timer = self.create_debounce_timer(self.search_loans)
+        self.loan_search.textChanged.connect(lambda _: self._loan_search_timer.start())
         actions.addWidget(self.loan_search)
-        loans_layout.insertLayout(0, actions)
+        loans_layout.addLayout(actions)
+
+        loans_layout.addWidget(self.active_loans_table)
 
         layout.addWidget(loans_card)
 
@@ -646,7 +918,8 @@ class LibraryApp(QtWidgets.QMainWindow):
         layout.addWidget(header)
 
         self.member_detail_search = QtWidgets.QLineEdit(); self.member_detail_search.setPlaceholderText("🔍 شماره دانشجویی یا نام...")
-        self.member_detail_search.textChanged.connect(self.search_member_details)
+        self._member_detail_search_timer = self.create_debounce_timer(self.search_member_details)
+        self.member_detail_search.textChanged.connect(lambda _: self._member_detail_search_timer.start())
         layout.addWidget(self.member_detail_search)
 
         self.member_info_label = QtWidgets.QLabel(""); self.member_info_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
@@ -658,31 +931,14 @@ class LibraryApp(QtWidgets.QMainWindow):
         lbl_active.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
         layout.addWidget(lbl_active)
 
-        self.member_active_loans = QtWidgets.QTableWidget(0,5)
-        
-        self.member_active_loans.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #e0e0e0;
-                background-color: #ffffff;
-                alternate-background-color: #fafafa;
-                selection-background-color: #d9edf7;
-                selection-color: #000;
-                border: 1px solid #ddd;
-            }
-            QHeaderView::section {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                font-weight: bold;
-                padding: 4px;
-            }
-        """)
-        
-        self.member_active_loans.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.member_active_loans.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
-        self.member_active_loans.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
-        
-        self.member_active_loans.setHorizontalHeaderLabels(["کتاب","تاریخ امانت","تاریخ سررسید","روزهای باقی‌مانده","جریمه"])
-        self.member_active_loans.horizontalHeader().setStretchLastSection(True)
+        # ردیف‌ها: (عنوان کتاب، تاریخ امانت، تاریخ سررسید، روزهای باقی‌مانده، جریمه)
+        self.member_active_loans_model = RecordTableModel(
+            ["کتاب","تاریخ امانت","تاریخ سررسید","روزهای باقی‌مانده","جریمه"],
+            [lambda r: r[0], lambda r: to_jalali(r[1]), lambda r: to_jalali(r[2]), lambda r: r[3], lambda r: r[4]],
+            {4: "{:,}"}
+        )
+        self.member_active_loans = self.create_table(self.member_active_loans_model)
+
         layout.addWidget(self.member_active_loans, stretch=1)
         
         # ---- بخش تاریخچه امانت‌ها ----
@@ -691,31 +947,17 @@ class LibraryApp(QtWidgets.QMainWindow):
         lbl_history.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
         layout.addWidget(lbl_history)
 
-        self.member_history = QtWidgets.QTableWidget(0,6)
-        
-        self.member_history.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #e0e0e0;
-                background-color: #ffffff;
-                alternate-background-color: #fafafa;
-                selection-background-color: #d9edf7;
-                selection-color: #000;
-                border: 1px solid #ddd;
-            }
-            QHeaderView::section {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                font-weight: bold;
-                padding: 4px;
-            }
-        """)
-        
-        self.member_history.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.member_history.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
-        self.member_history.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
-        
-        self.member_history.setHorizontalHeaderLabels(["کتاب","تاریخ امانت","تاریخ سررسید","تاریخ بازگشت","وضعیت","جریمه پرداخت نشده"])
-        self.member_history.horizontalHeader().setStretchLastSection(True)
+        self.member_history_model = RecordTableModel(
+            ["کتاب","تاریخ امانت","تاریخ سررسید","تاریخ بازگشت","وضعیت","جریمه پرداخت نشده"],
+            [lambda l: l.get("book_title",""), lambda l: to_jalali(l.get("loan_date","")),
+             lambda l: to_jalali(l.get("due_date","")),
+             lambda l: to_jalali(l.get("return_date") or ""),
+             lambda l: "فعال" if not l.get("return_date") else "بازگشته",
+             lambda l: to_int(l.get("unpaid_fine", 0))],
+            {5: "{:,}"}
+        )
+        self.member_history = self.create_table(self.member_history_model)
+
         layout.addWidget(self.member_history, stretch=1)
         
         # ---- دکمه تسویه جریمه‌ها ----
@@ -740,9 +982,8 @@ class LibraryApp(QtWidgets.QMainWindow):
             return
 
         unpaid_loans = [
-            loan for loan in self.loans
-            if loan.get("member_id") == member_id
-            and loan.get("return_date")
+            loan for loan in self._loans_by_member.get(member_id, [])
+            if loan.get("return_date")
             and loan.get("unpaid_fine", 0) > 0
         ]
 
@@ -759,11 +1000,13 @@ class LibraryApp(QtWidgets.QMainWindow):
         )
 
         if confirm == QtWidgets.QMessageBox.StandardButton.Yes:
+            self.member_total_fine -= sum(l["unpaid_fine"] for l in unpaid_loans if not l.get("fine_paid", False))
             for loan in unpaid_loans:
                 loan["unpaid_fine"] = 0
                 loan["fine_paid"] = True
+                self.member_history_model.record_changed(loan)
+            self.member_total_fine_label.setText(f"مجموع جریمه: {self.member_total_fine:,} تومان")
             self.save_data()
-            self.search_member_details()  # به‌روزرسانی صفحه
             QtWidgets.QMessageBox.information(self, "تسویه شد", "جریمه‌های بازگشتی با موفقیت تسویه شدند ✅")
 
     def create_book_details_page(self):
@@ -772,37 +1015,23 @@ class LibraryApp(QtWidgets.QMainWindow):
         header = QtWidgets.QLabel("📚 جزئیات کتاب"); header.setStyleSheet("font-size:18px; font-weight:800;"); header.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
         layout.addWidget(header)
 
-        self.book_detail_search = QtWidgets.QLineEdit(); self.book_detail_search.setPlaceholderText("🔍 عنوان یا نویسنده..."); self.book_detail_search.textChanged.connect(self.search_book_details)
+        self.book_detail_search = QtWidgets.QLineEdit(); self.book_detail_search.setPlaceholderText("🔍 عنوان یا نویسنده...")
+        self._book_detail_search_timer = self.create_debounce_timer(self.search_book_details)
+        self.book_detail_search.textChanged.connect(lambda _: self._book_detail_search_timer.start())
         layout.addWidget(self.book_detail_search)
 
         self.book_info_label = QtWidgets.QLabel(""); self.book_info_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
         layout.addWidget(self.book_info_label)
 
-        self.book_history = QtWidgets.QTableWidget(0,5)
-        
-        self.book_history.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #e0e0e0;
-                background-color: #ffffff;
-                alternate-background-color: #fafafa;
-                selection-background-color: #d9edf7;
-                selection-color: #000;
-                border: 1px solid #ddd;
-            }
-            QHeaderView::section {
-                background-color: #f7f7f7;
-                border: 1px solid #e0e0e0;
-                font-weight: bold;
-                padding: 4px;
-            }
-        """)
-        
-        self.book_history.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.book_history.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
-        self.book_history.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
-        
-        self.book_history.setHorizontalHeaderLabels(["عضو","تاریخ امانت","تاریخ سررسید","تاریخ بازگشت","وضعیت"])
-        self.book_history.horizontalHeader().setStretchLastSection(True)
+        self.book_history_model = RecordTableModel(
+            ["عضو","تاریخ امانت","تاریخ سررسید","تاریخ بازگشت","وضعیت"],
+            [lambda l: self.member_name(l.get("member_id")), lambda l: to_jalali(l.get("loan_date","")),
+             lambda l: to_jalali(l.get("due_date","")),
+             lambda l: to_jalali(l.get("return_date") or ""),
+             lambda l: "فعال" if not l.get("return_date") else "بازگشته"]
+        )
+        self.book_history = self.create_table(self.book_history_model)
+
         layout.addWidget(self.book_history, stretch=1)
         return page
         
@@ -810,15 +1039,8 @@ class LibraryApp(QtWidgets.QMainWindow):
         page = QtWidgets.QWidget()
         main_layout = QtWidgets.QVBoxLayout(page)
 
-        # 🔹 بخش تنظیمات - Use the unpacking version since create_section_card returns (section, layout)
-        settings_group, settings_layout = self.create_section_card("⚙️ تنظیمات", "#ffffff")
-        
-        # Change settings_layout from VBoxLayout to FormLayout
-        # First, remove the existing VBoxLayout
-        QtWidgets.QWidget().setLayout(settings_group.layout())
-        
-        # Create FormLayout for settings
-        settings_form_layout = QtWidgets.QFormLayout()
+        # 🔹 بخش تنظیمات - section with a FormLayout
+        settings_group, settings_form_layout = self.create_section_card("⚙️ تنظیمات", "#ffffff", QtWidgets.QFormLayout)
         settings_form_layout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
         settings_form_layout.setVerticalSpacing(10)
         settings_form_layout.setContentsMargins(5, 10, 5, 10)
@@ -839,14 +1061,8 @@ class LibraryApp(QtWidgets.QMainWindow):
         btn_save.clicked.connect(self.save_settings)
         settings_form_layout.addRow(btn_save)
 
-        settings_group.setLayout(settings_form_layout)
-
         # 🔹 بخش پشتیبان‌گیری
-        backup_group, backup_layout = self.create_section_card("🗄️ پشتیبان‌گیری و بازیابی", "#ffffff")
-        
-        # Change backup_layout to HBoxLayout
-        QtWidgets.QWidget().setLayout(backup_group.layout())
-        backup_hbox_layout = QtWidgets.QHBoxLayout()
+        backup_group, backup_hbox_layout = self.create_section_card("🗄️ پشتیبان‌گیری و بازیابی", "#ffffff", QtWidgets.QHBoxLayout)
 
         btn_backup = QtWidgets.QPushButton("📦 پشتیبان گیری")
         btn_backup.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
@@ -859,7 +1075,6 @@ class LibraryApp(QtWidgets.QMainWindow):
 
         backup_hbox_layout.addWidget(btn_backup)
         backup_hbox_layout.addWidget(btn_restore)
-        backup_group.setLayout(backup_hbox_layout)
 
         # 🔹 افزودن هر دو بخش به صفحه
         main_layout.addWidget(settings_group)
@@ -872,19 +1087,80 @@ class LibraryApp(QtWidgets.QMainWindow):
     def load_data(self):
         if os.path.exists(self.DATA_FILE):
             try:
-                with open(self.DATA_FILE, "r", encoding="utf-8") as f:
-                    d = json.load(f)
+                d = load_json(self.DATA_FILE)
                 self.members = d.get("members", [])
                 self.books = d.get("books", [])
                 self.loans = d.get("loans", [])
                 self.settings.update(d.get("settings", {}))
             except Exception as e:
                 QtWidgets.QMessageBox.warning(self, "خطا", f"خطا در بارگذاری داده‌ها:\n{e}")
+        self.build_indexes()
+
+    def build_indexes(self):
+        """Compute the lookup indexes and runtime caches after (re)loading data."""
+        self._members_by_id = {}
+        self._member_names = {}
+        for member in self.members:
+            self.index_member(member)
+        self._books_by_id = {b.get("id"): b for b in self.books}
+        self._available_total = sum(b.get("available_copies", 0) for b in self.books)
+        self._loans_by_member = {}
+        self._loans_by_book = {}
+        self._active_loans = []
+        for loan in self.loans:
+            self.index_loan(loan)
+
+    def index_member(self, member: Dict):
+        """Add a member to the id index and cache its display name."""
+        sid = member.get("student_id")
+        self._members_by_id[sid] = member
+        self._member_names[sid] = f"{member.get('first_name','')} {member.get('last_name','')}"
+
+    def unindex_member(self, sid: str):
+        self._members_by_id.pop(sid, None)
+        self._member_names.pop(sid, None)
+
+    def set_available_copies(self, book: Dict, copies: int):
+        """Set a book's available copies, keeping the running total in step."""
+        self._available_total += copies - book.get("available_copies", 0)
+        book["available_copies"] = copies
+
+    def index_loan(self, loan: Dict):
+        """Add a loan to the per-member, per-book and active loan lists and cache its due date."""
+        self._loans_by_member.setdefault(loan.get("member_id"), []).append(loan)
+        self._loans_by_book.setdefault(loan.get("book_id"), []).append(loan)
+        if loan.get("return_date") is None:
+            self._active_loans.append(loan)
+        self.cache_due_date(loan)
+
+    def cache_due_date(self, loan: Dict):
+        """Cache the due date of a loan as a day ordinal ('_due_ord'), None if invalid."""
+        try:
+            loan["_due_ord"] = date_ordinal(loan.get("due_date") or "")
+        except (ValueError, TypeError, AttributeError):
+            loan["_due_ord"] = None
+
+    def data_to_save(self) -> Dict:
+        return {"members": without_cache_fields(self.members), "books": without_cache_fields(self.books),
+                "loans": without_cache_fields(self.loans), "settings": self.settings}
 
     def save_data(self):
-        d = {"members": self.members, "books": self.books, "loans": self.loans, "settings": self.settings}
-        with open(self.DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(d, f, ensure_ascii=False, indent=2)
+        """Schedule a write of the data file — a burst of edits is written once."""
+        self._save_pending = True
+        self._save_timer.start()
+
+    def flush_data(self):
+        """Write pending changes to the data file now."""
+        self._save_timer.stop()
+        if not self._save_pending:
+            return
+        self._save_pending = False
+        # ابتدا در فایل موقت نوشته و سپس جایگزین می‌شود تا فایل اصلی نیمه‌کاره نماند
+        write_atomic(self.DATA_FILE, dump_json(self.data_to_save()))
+
+    def closeEvent(self, event):
+        self.flush_data()
+        super().closeEvent(event)
 
     # ---------- Refresh UI ----------
     def refresh_ui(self):
@@ -898,130 +1174,70 @@ class LibraryApp(QtWidgets.QMainWindow):
     def update_stats(self):
         self.lbl_members_count.setText(str(len(self.members)))
         self.lbl_books_count.setText(str(len(self.books)))
-        active_loans = len([l for l in self.loans if not l.get("return_date")])
-        self.lbl_loans_count.setText(str(active_loans))
-        available_books = sum(b.get("available_copies", 0) for b in self.books)
-        self.lbl_available_count.setText(str(available_books))
+        self.lbl_loans_count.setText(str(len(self._active_loans)))
+        self.lbl_available_count.setText(str(self._available_total))
 
     def update_overdue_table(self):
-        self.overdue_table.setSortingEnabled(False)
-        self.overdue_table.setRowCount(0)
-        today = datetime.date.today()
-        for loan in self.loans:
-            if loan.get("return_date") is None:
-                try:
-                    due = datetime.datetime.strptime(loan.get("due_date",""), "%Y-%m-%d").date()
-                    if due < today:
-                        days = (today - due).days
-                        mem = next((m for m in self.members if m.get("student_id")==loan.get("member_id")), None)
-                        memname = f"{mem.get('first_name','')} {mem.get('last_name','')}" if mem else loan.get("member_id")
-                        fine_per_day = self.settings.get("fine_per_day", 1000)
-                        fine = days * fine_per_day
-                        r = self.overdue_table.rowCount()
-                        self.overdue_table.insertRow(r)
-                        
-                        # ستون‌های متنی
-                        self.overdue_table.setItem(r, 0, QtWidgets.QTableWidgetItem(memname))
-                        self.overdue_table.setItem(r, 1, QtWidgets.QTableWidgetItem(loan.get("book_title","")))
-                        self.overdue_table.setItem(r, 2, QtWidgets.QTableWidgetItem(to_jalali(loan.get("due_date",""))))
-                        
-                        # ستون‌های عددی با آیتم مخصوص
-                        self.overdue_table.setItem(r, 3, NumericTableWidgetItem(days))
-                        self.overdue_table.setItem(r, 4, NumericTableWidgetItem(fine, "{:,}"))
-                        
-                except Exception as e:
-                    print(f"Error in update_overdue_table: {e}")
-                    continue
-        self.overdue_table.setSortingEnabled(True)
+        rows = []
+        today_ord = datetime.date.today().toordinal()
+        fine_per_day = self.settings.get("fine_per_day", 1000)
+        for loan in self._active_loans:
+            due_ord = loan.get("_due_ord")
+            if due_ord is None:
+                print(f"Error in update_overdue_table: invalid due date {loan.get('due_date')!r}")
+                continue
+            days = today_ord - due_ord
+            if days > 0:
+                memname = self.member_name(loan.get("member_id"))
+                rows.append((memname, loan.get("book_title",""), loan.get("due_date",""), days, days * fine_per_day))
+        self.overdue_model.set_rows(rows)
 
     def load_members_table(self, filtered: List[Dict] = None):
-        self.members_table.setSortingEnabled(False)
+        if self.page_members is None:
+            return
         rows = filtered if filtered is not None else self.members
-        self.members_table.setRowCount(0)
-        for m in rows:
-            r = self.members_table.rowCount(); self.members_table.insertRow(r)
-            self.members_table.setItem(r,0, QtWidgets.QTableWidgetItem(m.get("student_id","")))
-            self.members_table.setItem(r,1, QtWidgets.QTableWidgetItem(m.get("national_id","")))
-            self.members_table.setItem(r,2, QtWidgets.QTableWidgetItem(m.get("phone","")))
-            self.members_table.setItem(r,3, QtWidgets.QTableWidgetItem(m.get("first_name","")))
-            self.members_table.setItem(r,4, QtWidgets.QTableWidgetItem(m.get("last_name","")))
-        self.members_table.setSortingEnabled(True)
+        self.members_model.set_rows(rows)
 
     def load_books_table(self, filtered: List[Dict] = None):
-        self.books_table.setSortingEnabled(False)
+        if self.page_books is None:
+            return
         rows = filtered if filtered is not None else self.books
-        self.books_table.setRowCount(0)
-                
-        for i, b in enumerate(rows):
-            r = self.books_table.rowCount()
-            self.books_table.insertRow(r)
-            
-            # دریافت اطلاعات با مقادیر پیش‌فرض
-            title = b.get("title", "بدون عنوان") or "بدون عنوان"
-            author = b.get("author", "بدون نویسنده") or "بدون نویسنده"
-            publish_date = b.get("publish_date", "تاریخ نامشخص") or "تاریخ نامشخص"
-            total_copies = b.get("total_copies", 0)
-            available_copies = b.get("available_copies", 0)
-                        
-            # ایجاد آیتم‌ها و تنظیم مستقیم متن
-            title_item = QtWidgets.QTableWidgetItem()
-            title_item.setText(title)
-            
-            author_item = QtWidgets.QTableWidgetItem()
-            author_item.setText(author)
-            
-            date_item = QtWidgets.QTableWidgetItem()
-            date_item.setText(to_jalali(publish_date))
-            
-            # وضعیت کتاب
-            if available_copies > 0:
-                status = f"آزاد ({available_copies} از {total_copies})"
-            else:
-                status = f"امانت داده شده (0 از {total_copies})"
-            
-            status_item = QtWidgets.QTableWidgetItem()
-            status_item.setText(status)
-            
-            # قرار دادن آیتم‌ها در جدول
-            self.books_table.setItem(r, 0, title_item)
-            self.books_table.setItem(r, 1, author_item)
-            self.books_table.setItem(r, 2, date_item)
-            self.books_table.setItem(r, 3, status_item)
-        self.books_table.setSortingEnabled(True)
-        
+        self.books_model.set_rows(rows)
+
+    def refresh_loans_page(self):
+        self.update_loan_combos()
+        self.load_active_loans()
+
     def load_active_loans(self):
-        self.active_loans_table.setSortingEnabled(False)
-        self.active_loans_table.setRowCount(0)
-        for loan in self.loans:
-            if loan.get("return_date") is None:
-                r = self.active_loans_table.rowCount()
-                self.active_loans_table.insertRow(r)
-                
-                # ستون شناسه (عددی)
-                self.active_loans_table.setItem(r, 0, NumericTableWidgetItem(loan.get("id", 0)))
-                
-                mem = next((m for m in self.members if m.get("student_id")==loan.get("member_id")), None)
-                memname = f"{mem.get('first_name','')} {mem.get('last_name','')}" if mem else loan.get("member_id")
-                self.active_loans_table.setItem(r, 1, QtWidgets.QTableWidgetItem(memname))
-                self.active_loans_table.setItem(r, 2, QtWidgets.QTableWidgetItem(loan.get("book_title","")))
-                self.active_loans_table.setItem(r, 3, QtWidgets.QTableWidgetItem(to_jalali(loan.get("loan_date",""))))
-                self.active_loans_table.setItem(r, 4, QtWidgets.QTableWidgetItem(to_jalali(loan.get("due_date",""))))
-        self.active_loans_table.setSortingEnabled(True)
+        if self.page_loans is None:
+            return
+        self.active_loans_model.set_rows(self._active_loans)
 
     def update_loan_combos(self):
-        # Insert a default empty option first so nothing is selected by default
+        if self.page_loans is None:
+            return
+        # Labels and ids are kept as parallel lists; index 0 is the empty "select" option
+        member_labels = [f"{m.get('first_name','')} {m.get('last_name','')} ({m.get('student_id','')})"
+                         for m in self.members]
+        self._loan_member_ids = [""] + [m.get("student_id") for m in self.members]
         self.loan_member_combo.clear()
-        self.loan_member_combo.addItem("— انتخاب عضو —", "")
-        for m in self.members:
-            self.loan_member_combo.addItem(f"{m.get('first_name','')} {m.get('last_name','')} ({m.get('student_id','')})", m.get("student_id"))
+        self.loan_member_combo.addItems(["— انتخاب عضو —"] + member_labels)
         self.loan_member_combo.setCurrentIndex(0)
+        self.loan_member_names.setStringList(member_labels)
 
+        available = [b for b in self.books if b.get("available_copies",0) > 0]
+        book_labels = [f"{b.get('id','')} - {b.get('title','')} ({b.get('available_copies',0)} نسخه)"
+                       for b in available]
+        self._loan_book_ids = [""] + [b.get("id") for b in available]
         self.loan_book_combo.clear()
-        self.loan_book_combo.addItem("— انتخاب کتاب —", "")
-        for b in self.books:
-            if b.get("available_copies",0) > 0:
-                self.loan_book_combo.addItem(f"{b.get('id','')} - {b.get('title','')} ({b.get('available_copies',0)} نسخه)", b.get("id"))
+        self.loan_book_combo.addItems(["— انتخاب کتاب —"] + book_labels)
         self.loan_book_combo.setCurrentIndex(0)
+        self.loan_book_names.setStringList(book_labels)
+
+    def combo_id(self, combo, ids: List[str]) -> str:
+        """Id at the combo's current position in its parallel id list — '' if none"""
+        index = combo.currentIndex()
+        return ids[index] if 0 <= index < len(ids) else ""
 
     # ---------- Member ops ----------
     def add_member(self):
@@ -1029,7 +1245,7 @@ class LibraryApp(QtWidgets.QMainWindow):
         if not sid:
             QtWidgets.QMessageBox.warning(self, "خطا", "شماره دانشجویی را وارد کنید")
             return
-        if any(m.get("student_id")==sid for m in self.members):
+        if sid in self._members_by_id:
             QtWidgets.QMessageBox.warning(self, "خطا", "عضو با این شماره دانشجویی وجود دارد")
             return
         member = {"student_id": sid,
@@ -1038,50 +1254,33 @@ class LibraryApp(QtWidgets.QMainWindow):
                   "first_name": self.input_first_name.text().strip(),
                   "last_name": self.input_last_name.text().strip()}
         self.members.append(member)
-        self.save_data(); self.load_members_table(); self.update_loan_combos(); self.update_stats()
+        self.index_member(member)
+        if matches_search(search_haystack(member, MEMBER_SEARCH_FIELDS), self.member_search_terms()):  # a filtered view only gets matching rows
+            self.members_model.append_record(member)
+        self.save_data(); self.mark_dirty("loans", "stats", "member_details")
         for w in [self.input_student_id, self.input_national_id, self.input_phone, self.input_first_name, self.input_last_name]:
             w.clear()
         QtWidgets.QMessageBox.information(self, "موفقیت", "عضو افزوده شد ✅")
 
     def search_members(self):
-        q = self.member_search.text().strip()
-        if not q:
-            self.load_members_table()
-            return
-
-        # تقسیم عبارت جستجو به کلمات
-        search_terms = [term.strip().lower() for term in q.split() if term.strip()]
-
+        search_terms = self.member_search_terms()
         if not search_terms:
             self.load_members_table()
             return
 
-        filtered = []
-        for m in self.members:
-            # ترکیب فیلدهای متنی
-            full_name = f"{m.get('first_name','')} {m.get('last_name','')}".lower()
-            student_id = m.get('student_id', '').lower()
-            national_id = m.get('national_id', '').lower()
-            phone = m.get('phone', '').lower()
-
-            # همه کلمات جستجو باید در یکی از این فیلدها باشند
-            if all(
-                any(term in field for field in [full_name, student_id, national_id, phone])
-                for term in search_terms
-            ):
-                filtered.append(m)
-
+        filtered = [m for m in self.members if matches_search(search_haystack(m, MEMBER_SEARCH_FIELDS), search_terms)]
         self.load_members_table(filtered)
 
+    def member_search_terms(self) -> List[str]:
+        """Terms of the members search box, for matches_search"""
+        # تقسیم عبارت جستجو به کلمات؛ همه کلمات باید در یکی از فیلدها باشند
+        return self.member_search.text().lower().split()
+
     def edit_member(self):
-        r = self.members_table.currentRow()
-        if r < 0:
+        member = self.selected_record(self.members_table)
+        if member is None:
             QtWidgets.QMessageBox.warning(self, "هشدار", "یک عضو انتخاب کنید")
             return
-        sid = self.members_table.item(r,0).text()
-        member = next((m for m in self.members if m.get("student_id")==sid), None)
-        if not member:
-            QtWidgets.QMessageBox.warning(self, "خطا", "عضو پیدا نشد"); return
         dlg = QtWidgets.QDialog(self); 
         dlg.setMinimumWidth(360); 
         dlg.setWindowTitle("ویرایش عضو"); 
@@ -1089,8 +1288,7 @@ class LibraryApp(QtWidgets.QMainWindow):
         layout = QtWidgets.QFormLayout(dlg)
         layout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight)  # اضافه شد
         
-        # ایجاد validator
-        only_digits_validator = QtGui.QRegularExpressionValidator(QtCore.QRegularExpression("[0-9]*"))
+        only_digits_validator = digits_validator()
         
         e_sid = QtWidgets.QLineEdit(member.get("student_id","")); 
         e_nid = QtWidgets.QLineEdit(member.get("national_id",""))
@@ -1116,20 +1314,32 @@ class LibraryApp(QtWidgets.QMainWindow):
         
         btn = QtWidgets.QPushButton("ذخیره"); 
         btn.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor)); 
-        btn.clicked.connect(lambda: (member.update({"student_id":e_sid.text().strip(),"national_id":e_nid.text().strip(),"phone":e_phone.text().strip(),"first_name":e_fn.text().strip(),"last_name":e_ln.text().strip()}), self.save_data(), self.load_members_table(), self.update_loan_combos(), dlg.accept()))
+        def save_member():
+            self.unindex_member(member.get("student_id"))
+            for loan in self._loans_by_member.get(member.get("student_id"), []):
+                loan.pop("_haystack", None)  # member name is part of the loan's search text
+            member.update({"student_id":e_sid.text().strip(),"national_id":e_nid.text().strip(),"phone":e_phone.text().strip(),"first_name":e_fn.text().strip(),"last_name":e_ln.text().strip()})
+            member.pop("_haystack", None)
+            self.index_member(member)
+            self.members_model.record_changed(member)
+            self.save_data(); self.mark_dirty("loans", "overdue", "member_details"); dlg.accept()
+
+        btn.clicked.connect(save_member)
         layout.addRow(btn); 
         dlg.exec()
 
     def delete_member(self):
-        r = self.members_table.currentRow()
-        if r < 0:
+        member = self.selected_record(self.members_table)
+        if member is None:
             QtWidgets.QMessageBox.warning(self, "هشدار", "یک عضو انتخاب کنید"); return
-        sid = self.members_table.item(r,0).text()
-        if any(l for l in self.loans if l.get("member_id")==sid and not l.get("return_date")):
+        sid = member.get("student_id")
+        if any(not l.get("return_date") for l in self._loans_by_member.get(sid, [])):
             QtWidgets.QMessageBox.critical(self, "خطا", "این عضو کتابی به امانت دارد و نمی‌توان حذف کرد"); return
         ans = QtWidgets.QMessageBox.question(self, "تأیید", "آیا حذف شود؟")
         if ans == QtWidgets.QMessageBox.StandardButton.Yes:
-            self.members = [m for m in self.members if m.get("student_id")!=sid]; self.save_data(); self.load_members_table(); self.update_loan_combos(); self.update_stats()
+            self.members = [m for m in self.members if m.get("student_id")!=sid]; self.unindex_member(sid)
+            self.members_model.remove_record(member)
+            self.save_data(); self.mark_dirty("loans", "stats", "member_details")
 
     # ---------- Book ops ----------
     def add_book(self):
@@ -1138,84 +1348,40 @@ class LibraryApp(QtWidgets.QMainWindow):
         if not title or not author:
             QtWidgets.QMessageBox.warning(self, "خطا", "عنوان و نویسنده را وارد کنید"); return
         book_id = f"{title}_{author}_{publish}".replace(" ", "_")
-        existing = next((b for b in self.books if b.get("id")==book_id), None)
+        existing = self._books_by_id.get(book_id)
         if existing:
             existing["total_copies"] = existing.get("total_copies",0) + copies
-            existing["available_copies"] = existing.get("available_copies",0) + copies
+            self.set_available_copies(existing, existing.get("available_copies",0) + copies)
+            self.books_model.record_changed(existing)
         else:
             b = {"id": book_id, "title": title, "author": author, "publish_date": publish, "total_copies": copies, "available_copies": copies, "is_borrowed": False}
             self.books.append(b)
-        self.save_data(); self.load_books_table(); self.update_loan_combos(); self.update_stats()
+            self._books_by_id[book_id] = b
+            self._available_total += copies
+            if matches_search(search_haystack(b, BOOK_SEARCH_FIELDS), self.book_search_terms()):
+                self.books_model.append_record(b)
+        self.save_data(); self.mark_dirty("loans", "stats", "book_details")
         self.input_title.clear(); self.input_author.clear(); self.input_publish.clear(); self.input_copies.setValue(1)
         QtWidgets.QMessageBox.information(self, "موفقیت", "کتاب افزوده شد ✅")
 
     def search_books(self):
-        q = self.book_search.text().strip().lower()
-        if not q:
+        search_terms = self.book_search_terms()
+        if not search_terms:
             self.load_books_table(); return
-        filtered = [b for b in self.books if q in b.get("title","").lower() or q in b.get("author","").lower() or q in b.get("publish_date","").lower()]
+        filtered = [b for b in self.books if matches_search(search_haystack(b, BOOK_SEARCH_FIELDS), search_terms)]
         self.load_books_table(filtered)
 
+    def book_search_terms(self) -> List[str]:
+        """The books search box as a single term for matches_search — none when it is empty"""
+        q = self.book_search.text().strip().lower()
+        return [q] if q else []
+
     def edit_book(self):
-        r = self.books_table.currentRow()
-        if r < 0: 
+        book = self.selected_record(self.books_table)
+        if book is None:
             QtWidgets.QMessageBox.warning(self, "هشدار", "یک کتاب انتخاب کنید")
             return
-        
-        # دریافت عنوان از جدول
-        title_item = self.books_table.item(r, 0)
-        if not title_item:
-            QtWidgets.QMessageBox.warning(self, "خطا", "عنوان کتاب پیدا نشد")
-            return
-            
-        selected_title = title_item.text()
-        
-        # نرمال‌سازی حروف فارسی/عربی برای مقایسه بهتر
-        def normalize_text(text):
-            if not text:
-                return ""
-            # تبدیل حروف عربی به فارسی
-            text = text.replace('ي', 'ی')  # ی عربی به فارسی
-            text = text.replace('ك', 'ک')  # ک عربی به فارسی
-            text = text.replace('ۂ', 'ه')  # ه عربی به فارسی
-            return text.strip()
-        
-        normalized_selected_title = normalize_text(selected_title)
-        
-        # پیدا کردن کتاب با تطبیق نرمال‌سازی شده
-        book = None
-        for b in self.books:
-            book_title = b.get("title", "")
-            normalized_book_title = normalize_text(book_title)
-            
-            # مقایسه عنوان‌های نرمال‌سازی شده
-            if normalized_book_title == normalized_selected_title:
-                book = b
-                break
-        
-        # اگر با عنوان پیدا نشد، سعی کن با ID پیدا کنی
-        if not book:
-            author_item = self.books_table.item(r, 1)
-            selected_author = author_item.text() if author_item else ""
-            normalized_selected_author = normalize_text(selected_author)
-            
-            for b in self.books:
-                book_title = b.get("title", "")
-                book_author = b.get("author", "")
-                
-                normalized_book_title = normalize_text(book_title)
-                normalized_book_author = normalize_text(book_author)
-                
-                if (normalized_book_title == normalized_selected_title and 
-                    normalized_selected_author and 
-                    normalized_book_author == normalized_selected_author):
-                    book = b
-                    break
-        
-        if not book:
-            QtWidgets.QMessageBox.warning(self, "خطا", f"کتاب پیدا نشد\nعنوان انتخاب شده: '{selected_title}'\nعنوان نرمال‌سازی شده: '{normalized_selected_title}'")
-            return
-            
+
         # ادامه کد دیالوگ ویرایش...
         dlg = QtWidgets.QDialog(self)
         dlg.setWindowTitle("ویرایش کتاب")
@@ -1242,9 +1408,11 @@ class LibraryApp(QtWidgets.QMainWindow):
         layout.addRow("تعداد نسخه‌ها:", e_copies)
         
         def save_book():
+            old_id = book.get("id")
             new_title = e_title.text().strip()
             new_author = e_author.text().strip()
             new_total = e_copies.value()
+            diff = new_total - book.get("total_copies", 0)  # before the update overwrites the old total
             
             # به‌روزرسانی کتاب
             book.update({
@@ -1253,17 +1421,21 @@ class LibraryApp(QtWidgets.QMainWindow):
                 "publish_date": e_pub.text().strip(),
                 "total_copies": new_total
             })
+            book.pop("_haystack", None)
             
             # محاسبه نسخه‌های موجود
-            diff = new_total - book.get("total_copies", 0)
-            book["available_copies"] = max(0, book.get("available_copies", 0) + diff)
+            self.set_available_copies(book, max(0, book.get("available_copies", 0) + diff))
             
             # به‌روزرسانی ID کتاب اگر عنوان یا نویسنده تغییر کرد
             if new_title != book.get("title") or new_author != book.get("author"):
                 book["id"] = f"{new_title}_{new_author}".replace(" ", "_")
+            if book.get("id") != old_id:
+                self._books_by_id.pop(old_id, None)
+                self._books_by_id[book["id"]] = book
             
+            self.books_model.record_changed(book)
             self.save_data()
-            self.load_books_table()
+            self.mark_dirty("loans", "stats", "book_details")
             dlg.accept()
         
         b = QtWidgets.QPushButton("ذخیره")
@@ -1273,28 +1445,28 @@ class LibraryApp(QtWidgets.QMainWindow):
         dlg.exec()
     
     def delete_book(self):
-        r = self.books_table.currentRow(); 
-        if r < 0: QtWidgets.QMessageBox.warning(self, "هشدار", "یک کتاب انتخاب کنید"); return
-        title = self.books_table.item(r,0).text(); author = self.books_table.item(r,1).text()
-        book = next((b for b in self.books if b.get("title")==title and b.get("author")==author), None)
-        if not book: QtWidgets.QMessageBox.warning(self, "خطا", "کتاب پیدا نشد"); return
+        book = self.selected_record(self.books_table)
+        if book is None: QtWidgets.QMessageBox.warning(self, "هشدار", "یک کتاب انتخاب کنید"); return
         if book.get("available_copies",0) < book.get("total_copies",0):
             QtWidgets.QMessageBox.critical(self, "خطا", "این کتاب به امانت داده شده و نمی‌توان حذف کرد"); return
         ans = QtWidgets.QMessageBox.question(self, "تأیید", "آیا حذف شود؟")
         if ans == QtWidgets.QMessageBox.StandardButton.Yes:
-            self.books = [b for b in self.books if not (b.get("title")==title and b.get("author")==author)]; self.save_data(); self.load_books_table(); self.update_loan_combos(); self.update_stats()
+            self.books = [b for b in self.books if b is not book]; self._books_by_id.pop(book.get("id"), None)
+            self._available_total -= book.get("available_copies", 0)
+            self.books_model.remove_record(book)
+            self.save_data(); self.mark_dirty("loans", "stats", "book_details")
 
     # ---------- Loan ops ----------
     def loan_book(self):
         # اطمینان از انتخاب عضو و کتاب
-        member_id = self.loan_member_combo.currentData()
-        book_id = self.loan_book_combo.currentData()
+        member_id = self.combo_id(self.loan_member_combo, self._loan_member_ids)
+        book_id = self.combo_id(self.loan_book_combo, self._loan_book_ids)
         if not member_id or not book_id:
             QtWidgets.QMessageBox.warning(self, "خطا", "لطفاً یک عضو و یک کتاب انتخاب کنید")
             return
 
         # پیدا کردن کتاب انتخاب‌شده
-        book = next((b for b in self.books if b.get("id") == book_id), None)
+        book = self._books_by_id.get(book_id)
 
         # 🟢 ایجاد دیالوگ تعیین روزهای امانت (با مقدار پیش‌فرض از تنظیمات)
         dialog = QtWidgets.QDialog(self)
@@ -1326,7 +1498,7 @@ class LibraryApp(QtWidgets.QMainWindow):
 
         # 🧮 ثبت امانت جدید
         loan_date = today_gregorian_str()
-        due_date = (datetime.date.today() + datetime.timedelta(days=period)).strftime("%Y-%m-%d")
+        due_date = today_gregorian_str(period)
         loan = {
             "id": len(self.loans) + 1,
             "member_id": member_id,
@@ -1339,18 +1511,20 @@ class LibraryApp(QtWidgets.QMainWindow):
         }
 
         if book:
-            book["available_copies"] = max(0, book.get("available_copies", 0) - 1)
+            self.set_available_copies(book, max(0, book.get("available_copies", 0) - 1))
             if book.get("available_copies", 0) == 0:
                 book["is_borrowed"] = True
 
         # ذخیره تغییرات
+        self.index_loan(loan)
         self.loans.append(loan)
         self.save_data()
-        self.load_active_loans()
-        self.update_loan_combos()
-        self.load_books_table()
-        self.update_overdue_table()
-        self.update_stats()
+        if matches_search(self.loan_haystack(loan), self.loan_search_terms()):
+            self.active_loans_model.append_record(loan)
+        if book and self.page_books is not None:
+            self.books_model.record_changed(book)
+        # a new loan cannot be overdue yet, so the overdue table is left alone
+        self.mark_dirty("loans", "stats", "member_details", "book_details")
 
         QtWidgets.QMessageBox.information(
             self,
@@ -1359,54 +1533,28 @@ class LibraryApp(QtWidgets.QMainWindow):
         )
         
     def search_loans(self):
-        self.active_loans_table.setSortingEnabled(False)
-        q = self.loan_search.text().strip().lower()
-        if not q:
+        search_terms = self.loan_search_terms()
+        if not search_terms:
             self.load_active_loans()
             return
 
-        filtered = []
-        for loan in self.loans:
-            if loan.get("return_date") is not None:
-                continue  # فقط امانت‌های فعال نمایش داده شوند
-            member = next((m for m in self.members if m.get("student_id") == loan.get("member_id")), {})
-            memname = f"{member.get('first_name', '')} {member.get('last_name', '')}".strip()
-            # بررسی تطابق در همه‌ی فیلدها
-            if (
-                q in str(loan.get("id", "")).lower()
-                or q in memname.lower()
-                or q in loan.get("book_title", "").lower()
-                or q in loan.get("loan_date", "").lower()
-                or q in loan.get("due_date", "").lower()
-            ):
-                filtered.append(loan)
+        # فقط امانت‌های فعال، با تطابق در همه‌ی فیلدها
+        filtered = [loan for loan in self._active_loans if matches_search(self.loan_haystack(loan), search_terms)]
 
         # بارگذاری مجدد جدول فقط با ردیف‌های فیلتر شده
-        self.active_loans_table.setRowCount(0)
-        for loan in filtered:
-            r = self.active_loans_table.rowCount()
-            self.active_loans_table.insertRow(r)
-            self.active_loans_table.setItem(r, 0, QtWidgets.QTableWidgetItem(str(loan.get("id", ""))))
-            mem = next((m for m in self.members if m.get("student_id") == loan.get("member_id")), None)
-            memname = f"{mem.get('first_name', '')} {mem.get('last_name', '')}" if mem else loan.get("member_id")
-            self.active_loans_table.setItem(r, 1, QtWidgets.QTableWidgetItem(memname))
-            self.active_loans_table.setItem(r, 2, QtWidgets.QTableWidgetItem(loan.get("book_title", "")))
-            self.active_loans_table.setItem(r, 3, QtWidgets.QTableWidgetItem(to_jalali(loan.get("loan_date", ""))))
-            self.active_loans_table.setItem(r, 4, QtWidgets.QTableWidgetItem(to_jalali(loan.get("due_date", ""))))
-        self.active_loans_table.setSortingEnabled(True)
+        self.active_loans_model.set_rows(filtered)
+
+    def loan_search_terms(self) -> List[str]:
+        """The loans search box as a single term for matches_search — none when it is empty"""
+        q = self.loan_search.text().strip().lower()
+        return [q] if q else []
 
     def renew_loan(self):
-        r = self.active_loans_table.currentRow()
-        if r < 0:
+        loan = self.selected_record(self.active_loans_table)
+        if loan is None:
             QtWidgets.QMessageBox.warning(self, "هشدار", "یک امانت انتخاب کنید")
             return
 
-        loan_id = int(self.active_loans_table.item(r, 0).text())
-        loan = next((l for l in self.loans if l.get("id") == loan_id), None)
-        if not loan:
-            QtWidgets.QMessageBox.warning(self, "خطا", "امانت پیدا نشد")
-            return
-
         # 🟢 ساخت دیالوگ سفارشی برای تمدید
         dialog = QtWidgets.QDialog(self)
         dialog.setWindowTitle("تمدید امانت")
@@ -1432,16 +1580,24 @@ class LibraryApp(QtWidgets.QMainWindow):
         # نمایش دیالوگ
         if dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted:
             days = spin.value()
-            due = datetime.datetime.strptime(loan.get("due_date"), "%Y-%m-%d")
-            new_due = (due + datetime.timedelta(days=days)).strftime("%Y-%m-%d")
+            today_ord = datetime.date.today().toordinal()
+            due_ord = loan.get("_due_ord")
+            was_overdue = due_ord is not None and due_ord < today_ord
+            if due_ord is None:
+                due_ord = today_ord
+            new_due = datetime.date.fromordinal(due_ord + days).isoformat()
 
             loan["due_date"] = new_due
+            loan.pop("_haystack", None)
+            self.cache_due_date(loan)
             loan["renewed"] = True
             loan["loan_period"] = loan.get("loan_period", 0) + days
 
             self.save_data()
-            self.load_active_loans()
-            self.update_overdue_table()
+            self.active_loans_model.record_changed(loan)
+            self.mark_dirty("member_details")
+            if was_overdue:  # only a loan that was overdue can change the overdue table
+                self.mark_dirty("overdue")
 
             QtWidgets.QMessageBox.information(
                 self,
@@ -1450,24 +1606,19 @@ class LibraryApp(QtWidgets.QMainWindow):
             )
 
     def return_book(self):
-        r = self.active_loans_table.currentRow()
-        if r < 0:
+        loan = self.selected_record(self.active_loans_table)
+        if loan is None:
             QtWidgets.QMessageBox.warning(self, "خطا", "یک امانت انتخاب کنید")
             return
 
-        loan_id = int(self.active_loans_table.item(r, 0).text())
-        loan = next((l for l in self.loans if l.get("id") == loan_id), None)
-        if not loan:
-            QtWidgets.QMessageBox.warning(self, "خطا", "امانت پیدا نشد")
-            return
-
-        today = datetime.date.today()
-        due_date = datetime.datetime.strptime(loan.get("due_date"), "%Y-%m-%d").date()
-        days_overdue = (today - due_date).days if today > due_date else 0
+        today_ord = datetime.date.today().toordinal()
+        due_ord = loan.get("_due_ord")
+        days_overdue = max(0, today_ord - due_ord) if due_ord is not None else 0
         fine_per_day = self.settings.get("fine_per_day", 1000)
         fine = days_overdue * fine_per_day
 
-        loan["return_date"] = today.strftime("%Y-%m-%d")
+        loan["return_date"] = today_gregorian_str()
+        self._active_loans.remove(loan)
 
         # 🔹 اگر جریمه وجود دارد
         if fine > 0:
@@ -1495,38 +1646,34 @@ class LibraryApp(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.information(self, "بازگشت", "بازگشت با موفقیت ثبت شد ✅")
 
         # 🔹 بروزرسانی کتاب‌ها و ذخیره
-        book = next((b for b in self.books if b.get("id") == loan.get("book_id")), None)
+        book = self._books_by_id.get(loan.get("book_id"))
         if book:
-            book["available_copies"] = book.get("available_copies", 0) + 1
+            self.set_available_copies(book, book.get("available_copies", 0) + 1)
             if book["available_copies"] > 0:
                 book["is_borrowed"] = False
 
         self.save_data()
-        self.update_loan_combos()
-        self.load_books_table()        
-        self.load_active_loans()
-        self.update_overdue_table()
-        self.update_stats()
+        if book and self.page_books is not None:
+            self.books_model.record_changed(book)
+        self.active_loans_model.remove_record(loan)
+        self.mark_dirty("loans", "stats", "member_details", "book_details")
+        if days_overdue > 0:
+            self.mark_dirty("overdue")
 
     # ---------- Details search ----------
     def search_member_details(self):
-        self.member_active_loans.setSortingEnabled(False)
-        self.member_history.setSortingEnabled(False)
-        q = self.member_detail_search.text().strip().lower()
+        text = self.member_detail_search.text().strip()
+        q = text.lower()
         if not q:
             self.member_info_label.setText("")
-            self.member_active_loans.setRowCount(0)
-            self.member_history.setRowCount(0)
+            self.member_active_loans_model.set_rows([])
+            self.member_history_model.set_rows([])
             return
 
-        member = next(
-            (m for m in self.members if
-             q in m.get("student_id", "").lower()
-             or q in m.get("first_name", "").lower()
-             or q in m.get("phone", "").lower()
-             or q in m.get("national_id", "").lower()
-             or q in m.get("last_name", "").lower()), None
-        )
+        # an exact student id (e.g. from a double click) is looked up directly
+        member = self._members_by_id.get(text)
+        if member is None:
+            member = next((m for m in self.members if q in search_haystack(m, MEMBER_SEARCH_FIELDS)), None)
         if not member:
             self.member_info_label.setText("عضو پیدا نشد")
             return
@@ -1541,109 +1688,79 @@ class LibraryApp(QtWidgets.QMainWindow):
         )
         self.member_info_label.setText(info)
 
-        member_loans = [l for l in self.loans if l.get("member_id") == member.get("student_id")]
-        self.member_active_loans.setRowCount(0)
-        self.member_history.setRowCount(0)
+        member_loans = self._loans_by_member.get(member.get("student_id"), [])
+        active_rows = []
+        history_rows = []
 
         # محاسبه جریمه کل
         total_fine = 0
         fine_per_day = self.settings.get("fine_per_day", 1000)
-        today = datetime.date.today()
+        today_ord = datetime.date.today().toordinal()
         
         for loan in member_loans:
-            if not loan.get("fine_paid", False):
-                total_fine += loan.get("unpaid_fine", 0)
-                
-            if loan.get("return_date") is None:
-                r = self.member_active_loans.rowCount()
-                self.member_active_loans.insertRow(r)
+            get = loan.get
+            if not get("fine_paid", False):
+                total_fine += get("unpaid_fine", 0)
                 
-                self.member_active_loans.setItem(r, 0, QtWidgets.QTableWidgetItem(loan.get("book_title","")))
-                self.member_active_loans.setItem(r, 1, QtWidgets.QTableWidgetItem(to_jalali(loan.get("loan_date",""))))
-                self.member_active_loans.setItem(r, 2, QtWidgets.QTableWidgetItem(to_jalali(loan.get("due_date",""))))
+            if get("return_date") is None:
+                due_ord = get("_due_ord")
+                days_remaining = due_ord - today_ord if due_ord is not None else 0
                 
-                due = datetime.datetime.strptime(loan.get("due_date"), "%Y-%m-%d").date()
-                days_remaining = (due - today).days
-                
-                # ستون روزهای باقی‌مانده (عددی)
-                self.member_active_loans.setItem(r, 3, NumericTableWidgetItem(days_remaining))
-                
-                if due < today:
-                    days = (today - due).days
-                    fine = days * fine_per_day
+                if days_remaining < 0:
+                    fine = -days_remaining * fine_per_day
                     total_fine += fine
-                    self.member_active_loans.setItem(r, 4, NumericTableWidgetItem(fine, "{:,}"))
                 else:
-                    self.member_active_loans.setItem(r, 4, NumericTableWidgetItem(0, "{:,}"))
-                    
+                    fine = 0
+                active_rows.append((get("book_title",""), get("loan_date",""), get("due_date",""), days_remaining, fine))
             else:
-                r2 = self.member_history.rowCount()
-                self.member_history.insertRow(r2)
-                
-                self.member_history.setItem(r2, 0, QtWidgets.QTableWidgetItem(loan.get("book_title","")))
-                self.member_history.setItem(r2, 1, QtWidgets.QTableWidgetItem(to_jalali(loan.get("loan_date",""))))
-                self.member_history.setItem(r2, 2, QtWidgets.QTableWidgetItem(to_jalali(loan.get("due_date",""))))
-                self.member_history.setItem(r2, 3, QtWidgets.QTableWidgetItem(to_jalali(loan.get("return_date","")) if loan.get("return_date") else "-"))
-                self.member_history.setItem(r2, 4, QtWidgets.QTableWidgetItem("فعال" if not loan.get("return_date") else "بازگشته"))
-                
-                unpaid_fine = loan.get("unpaid_fine", 0)
-                self.member_history.setItem(r2, 5, NumericTableWidgetItem(unpaid_fine, "{:,}"))
+                history_rows.append(loan)
 
-        self.member_active_loans.setSortingEnabled(True)
-        self.member_history.setSortingEnabled(True)
+        self.member_active_loans_model.set_rows(active_rows)
+        self.member_history_model.set_rows(history_rows)
+        self.member_total_fine = total_fine
         self.member_total_fine_label.setText(f"مجموع جریمه: {total_fine:,} تومان")
 
     def search_book_details(self):
-        self.book_history.setSortingEnabled(False)
-        q = self.book_detail_search.text().strip().lower()
+        text = self.book_detail_search.text().strip()
+        q = text.lower()
         if not q:
-            self.book_info_label.setText(""); self.book_history.setRowCount(0); return
-        book = next((b for b in self.books if q in b.get("title","").lower() or q in b.get("author","").lower() or q in b.get("id","").lower()), None)
+            self.book_info_label.setText(""); self.book_history_model.set_rows([]); return
+        book = self._books_by_id.get(text)
+        if book is None:
+            book = next((b for b in self.books if q in b.get("title","").lower() or q in b.get("author","").lower() or q in b.get("id","").lower()), None)
         if not book: self.book_info_label.setText("کتاب پیدا نشد"); return
         info = f"عنوان: {book.get('title','')}\nنویسنده: {book.get('author','')}\nتاریخ چاپ: {to_jalali(book.get('publish_date',''))}\nکل نسخه‌ها: {book.get('total_copies',0)}\nنسخه‌های موجود: {book.get('available_copies',0)}"
         self.book_info_label.setText(info)
-        book_loans = [l for l in self.loans if l.get("book_id")==book.get("id")]
-        self.book_history.setRowCount(0)
-        for loan in book_loans:
-            r = self.book_history.rowCount(); self.book_history.insertRow(r)
-            mem = next((m for m in self.members if m.get("student_id")==loan.get("member_id")), None)
-            memname = f"{mem.get('first_name','')} {mem.get('last_name','')}" if mem else loan.get("member_id")
-            self.book_history.setItem(r,0, QtWidgets.QTableWidgetItem(memname))
-            self.book_history.setItem(r,1, QtWidgets.QTableWidgetItem(to_jalali(loan.get("loan_date",""))))
-            self.book_history.setItem(r,2, QtWidgets.QTableWidgetItem(to_jalali(loan.get("due_date",""))))
-            self.book_history.setItem(r,3, QtWidgets.QTableWidgetItem(to_jalali(loan.get("return_date","")) if loan.get("return_date") else "-"))
-            self.book_history.setItem(r,4, QtWidgets.QTableWidgetItem("فعال" if not loan.get("return_date") else "بازگشته"))
-        self.book_history.setSortingEnabled(True)
+        book_loans = self._loans_by_book.get(book.get("id"), [])
+        self.book_history_model.set_rows(book_loans)
 
     # ---------- Double click handlers ----------
-    def on_member_double_click(self, row, col):
-        sid = self.members_table.item(row, 0).text()
-        self.stack.setCurrentWidget(self.page_member_details)
+    def on_member_double_click(self, index):
+        sid = self.record_at(self.members_table, index).get("student_id", "")
+        self.show_page("member_details")
         self.member_detail_search.setText(sid)
+        self._member_detail_search_timer.stop()
         self.search_member_details()
 
-    def on_book_double_click(self, row, col):
-        title = self.books_table.item(row, 0).text()
-        author = self.books_table.item(row, 1).text()
-        publish = self.books_table.item(row, 2).text()
-        book_id = f"{title}_{author}_{publish}".replace(" ", "_")
-        self.stack.setCurrentWidget(self.page_book_details)
+    def on_book_double_click(self, index):
+        book_id = self.record_at(self.books_table, index).get("id", "")
+        self.show_page("book_details")
         self.book_detail_search.setText(book_id)
+        self._book_detail_search_timer.stop()
         self.search_book_details()
 
     # ---------- Settings / Backup ----------
     def save_settings(self):
         self.settings["default_loan_period"] = self.set_loan_period.value()
         self.settings["fine_per_day"] = self.set_fine_per_day.value()
-        self.save_data(); QtWidgets.QMessageBox.information(self, "موفقیت", "تنظیمات ذخیره شد ✅")
+        self.save_data(); self.mark_dirty("overdue", "member_details"); QtWidgets.QMessageBox.information(self, "موفقیت", "تنظیمات ذخیره شد ✅")
 
     def create_backup(self):
         try:
             if not os.path.exists("backup"): os.makedirs("backup")
             ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             fname = os.path.join("backup", f"library_backup_{ts}.json")
-            with open(fname, "w", encoding="utf-8") as f:
-                json.dump({"members": self.members, "books": self.books, "loans": self.loans, "settings": self.settings}, f, ensure_ascii=False, indent=2)
+            write_atomic(fname, dump_json(self.data_to_save(), pretty=True))
             QtWidgets.QMessageBox.information(self, "پشتیبان", f"پشتیبان ذخیره شد:\n{fname}")
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "خطا", f"خطا در پشتیبان‌گیری:\n{e}")
@@ -1652,63 +1769,41 @@ class LibraryApp(QtWidgets.QMainWindow):
         fname, _ = QtWidgets.QFileDialog.getOpenFileName(self, "انتخاب پشتیبان", "", "JSON Files (*.json);;All Files (*)")
         if not fname: return
         try:
-            with open(fname, "r", encoding="utf-8") as f:
-                d = json.load(f)
+            d = load_json(fname)
             self.members = d.get("members", []); self.books = d.get("books", []); self.loans = d.get("loans", []); self.settings.update(d.get("settings", {}))
+            self.build_indexes()
             self.save_data(); self.refresh_ui(); QtWidgets.QMessageBox.information(self, "بازیابی", "بازیابی انجام شد ✅")
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "خطا", f"خطا در بازیابی:\n{e}")
 
     # ---------- UI polish ----------
     def apply_styles(self):
+        app = QtWidgets.QApplication.instance()
+        if LibraryApp._app_qss is not None:
+            return  # already applied to the application
+        material_css = ""
         if QT_MATERIAL_AVAILABLE:
             try:
-                apply_stylesheet(app, theme='light_cyan_500.xml')
+                app.setStyle("Fusion")
+                material_css = build_stylesheet(theme='light_cyan_500.xml') or ""
             except Exception:
                 pass
 
-        # فقط دکمه‌های داخل section_card را سبز کنید
-        custom_css = """
-        QPushButton {
-            background-color: #4CAF50 !important;
-            color: white !important;
-            border: none !important;
-            padding: 8px 16px !important;
-            border-radius: 6px !important;
-            font-weight: bold !important;
-            font-size: 13px !important;
-            min-height: 30px !important;
-        }
-        QPushButton:hover {
-            background-color: #45a049 !important;
-        }
-        QPushButton:pressed {
-            background-color: #3d8b40 !important;
-        }
-
-        /* دکمه‌های خطر (حذف) */
-        QPushButton[danger="true"] {
-            background-color: #f44336 !important;
-        }
-        QPushButton[danger="true"]:hover {
-            background-color: #da190b !important;
-        }
-
-        /* دکمه‌های اطلاعات (ویرایش) */
-        QPushButton[info="true"] {
-            background-color: #2196F3 !important;
-        }
-        QPushButton[info="true"]:hover {
-            background-color: #0b7dda !important;
-        }
-        """
-
-        # اعمال روی کل برنامه
-        app.setStyleSheet(app.styleSheet() + custom_css)
+        # اعمال روی کل برنامه (یک بار، همراه با تم qt_material)
+        LibraryApp._app_qss = material_css + APP_QSS
+        app.setStyleSheet(LibraryApp._app_qss)
 
 # ---------- Run ----------
 if __name__ == "__main__":
+    # Coalesce paint/wheel event storms and keep widgets alien (set before QApplication exists)
+    QtCore.QCoreApplication.setAttribute(QtCore.Qt.ApplicationAttribute.AA_CompressHighFrequencyEvents, True)
+    QtWidgets.QApplication.setAttribute(QtCore.Qt.ApplicationAttribute.AA_DontCreateNativeWidgetSiblings, True)
     app = QtWidgets.QApplication(sys.argv)
+    # UI animations only add repaints here
+    for effect in (QtCore.Qt.UIEffect.UI_AnimateMenu, QtCore.Qt.UIEffect.UI_FadeMenu,
+                   QtCore.Qt.UIEffect.UI_AnimateCombo, QtCore.Qt.UIEffect.UI_AnimateTooltip,
+                   QtCore.Qt.UIEffect.UI_FadeTooltip):
+        QtWidgets.QApplication.setEffectEnabled(effect, False)
     # Provide a Persian-friendly default font if available
     font = QFont("Vazirmatn", 10)
     if not QFontInfo(font).family():
@@ -1718,9 +1813,10 @@ if __name__ == "__main__":
         getattr(sys, "_MEIPASS", os.path.dirname(__file__)),
         "icon.ico"
     )
-    app.setWindowIcon(QIcon(icon_path))
+    icon = QIcon(icon_path)
+    app.setWindowIcon(icon)
 
     win = LibraryApp()
-    win.setWindowIcon(QIcon(icon_path))
+    win.setWindowIcon(icon)
     win.show()
     sys.exit(app.exec())
@@ -0,0 +1,58 @@
+import json
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6 import QtCore, QtWidgets
+
+from libraryManager import LibraryApp
+
+DATA = {
+    "members": [{"first_name": "علی", "last_name": "رضایی", "student_id": "123",
+                 "national_id": "0012345678", "phone": "09120000000"}],
+    "books": [{"id": "B1", "title": "کتاب", "author": "نویسنده", "publish_date": "2020-01-01",
+               "total_copies": 2, "available_copies": 1}],
+    "loans": [
+        {"member_id": "123", "book_id": "B1", "book_title": "کتاب", "loan_date": "2024-01-01",
+         "due_date": 20240105, "return_date": None},
+        {"member_id": "123", "book_id": "B1", "book_title": "کتاب", "loan_date": "2023-01-01",
+         "due_date": 20230105, "return_date": "2023-01-03"},
+    ],
+}
+
+
+def display_texts(model):
+    role = QtCore.Qt.ItemDataRole.DisplayRole
+    return [model.data(model.index(row, col), role)
+            for row in range(model.rowCount()) for col in range(model.columnCount())]
+
+
+def test_numeric_due_date_is_displayed_as_text(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / LibraryApp.DATA_FILE).write_text(json.dumps(DATA), encoding="utf-8")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    win = LibraryApp()
+    assert win.loans[0]["_due_ord"] is None
+    assert display_texts(win.overdue_model) == []  # invalid due dates are skipped, not fined
+
+    win.show_page("loans")
+    assert "20240105" in display_texts(win.active_loans_model)
+
+    win.show_page("member_details")
+    win.member_detail_search.setText("123")
+    win.search_member_details()
+    assert "20240105" in display_texts(win.member_active_loans_model)
+    assert "20230105" in display_texts(win.member_history_model)
+
+    win.show_page("book_details")
+    win.book_detail_search.setText("B1")
+    win.search_book_details()
+    texts = display_texts(win.book_history_model)
+    assert "20240105" in texts and "20230105" in texts
+
+    win._save_pending = False  # nothing to write back into the test's data file
+    win.close()
+    app.processEvents()
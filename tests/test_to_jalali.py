@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libraryManager import to_jalali
+
+
+def test_iso_date_is_converted():
+    assert to_jalali("2024-01-05") == "1402/10/15"
+
+
+def test_empty_date():
+    assert to_jalali("") == "-"
+
+
+def test_non_iso_ten_character_input_is_returned_unchanged():
+    # publish_date is free text and is often entered already in Jalali form
+    assert to_jalali("1399/05/12") == "1399/05/12"
+    assert to_jalali("۱۳۹۹/۰۵/۱۲") == "۱۳۹۹/۰۵/۱۲"
+
+
+def test_non_string_input_is_returned_as_text():
+    # hand-edited JSON may hold numbers; raising here would abort Qt inside data()
+    assert to_jalali(1399) == "1399"
+    assert to_jalali(20240105) == "20240105"
+    assert to_jalali(None) == "-"